@@ -1,11 +1,11 @@
 
 import streamlit as st
-import requests
 import json
 import os
 from datetime import datetime
 from quiz import display_quiz_page 
 from picnic_planner import display_picnic_planner_page # Changed import
+from circuit_breaker import guarded_get_json, remember, fallback
 
 # Set page configuration
 st.set_page_config(
@@ -17,19 +17,19 @@ st.set_page_config(
 # Weather utilities
 def fetch_weather_data(city=None, latitude=None, longitude=None):
     base_url = "https://api.open-meteo.com/v1/forecast"
+    cache_key = ("weather", city.strip().lower()) if city else ("weather", latitude, longitude)
     if city and not (latitude and longitude):
         try:
             geocode_url = f"https://nominatim.openstreetmap.org/search?q={city}&format=json&limit=1"
             headers = {'User-Agent': 'CLIMATASK Weather App'}
-            response = requests.get(geocode_url, headers=headers)
-            data = response.json()
+            data = guarded_get_json("nominatim", geocode_url, headers=headers)
             if data:
                 latitude = float(data[0]['lat'])
                 longitude = float(data[0]['lon'])
             else:
                 return {"error": "City not found."}
         except Exception as e:
-            return {"error": str(e)}
+            return fallback(cache_key, e)
 
     if not (latitude and longitude):
         return {"error": "Missing location info."}
@@ -45,11 +45,11 @@ def fetch_weather_data(city=None, latitude=None, longitude=None):
     }
 
     try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        return response.json()
+        data = guarded_get_json("open-meteo", base_url, params=params)
+        remember(cache_key, data)
+        return data
     except Exception as e:
-        return {"error": str(e)}
+        return fallback(cache_key, e)
 
 def get_weather_icon(code):
     icons = {
@@ -103,6 +103,8 @@ def display_weather_page():
         if "error" in data:
             st.error(data["error"])
             return
+        if "stale_as_of" in data:
+            st.warning(f"Live data unavailable. Showing last known data as of {data['stale_as_of']}.")
 
         current = data.get("current_weather", {})
         daily = data.get("daily", {})
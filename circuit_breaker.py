@@ -0,0 +1,159 @@
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import requests
+
+FAILURE_THRESHOLD = 3         # Consecutive failures (or slow calls) that trip the breaker
+LATENCY_THRESHOLD = 5.0       # Calls slower than this many seconds count as failures
+RESET_TIMEOUT = 30            # Seconds the breaker stays open before a half-open probe
+STALE_CACHE_SIZE = 256        # Last known good responses kept per process
+CONNECT_TIMEOUT = 2.0
+# (connect, read) so a slow upstream is cut off within the latency threshold
+REQUEST_TIMEOUT = (CONNECT_TIMEOUT, LATENCY_THRESHOLD - CONNECT_TIMEOUT)
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class UpstreamError(Exception):
+    """Raised when a call to an upstream fails for any reason"""
+    def __init__(self, name):
+        super().__init__(f"{name} is temporarily unavailable")
+        self.name = name
+
+
+class CircuitOpenError(UpstreamError):
+    """Raised when an upstream is skipped because its breaker is open"""
+
+# --------------------------
+# Circuit Breaker
+# --------------------------
+class CircuitBreaker:
+    """Fail fast on an upstream that keeps erroring or responding slowly"""
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD,
+                 latency_threshold=LATENCY_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def before_call(self):
+        """Decide whether a call may go through, moving open to half-open once the timeout passes"""
+        with self.lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError(self.name)
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                # Only one probe at a time; everyone else keeps failing fast
+                if self.probing:
+                    raise CircuitOpenError(self.name)
+                self.probing = True
+
+    def record_success(self):
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+    def call(self, func, *args, **kwargs):
+        """Run func through the breaker, counting errors and slow responses as failures"""
+        self.before_call()
+        start = time.monotonic()
+        succeeded = False
+        try:
+            result = func(*args, **kwargs)
+            succeeded = time.monotonic() - start <= self.latency_threshold
+            return result
+        finally:
+            # Any other exit, including KeyboardInterrupt, must release a half-open probe
+            if succeeded:
+                self.record_success()
+            else:
+                self.record_failure()
+
+
+BREAKERS = {
+    "nominatim": CircuitBreaker("Location service"),
+    "open-meteo": CircuitBreaker("Weather service"),
+    "opentdb": CircuitBreaker("Quiz service")
+}
+
+
+def guarded_get_json(upstream, url, **kwargs):
+    """GET url through the named upstream's breaker and return the decoded JSON.
+
+    Timeouts, connection errors, HTTP errors and bad JSON all count as
+    failures and are raised as UpstreamError.
+    """
+    def get():
+        response = requests.get(url, timeout=REQUEST_TIMEOUT, **kwargs)
+        response.raise_for_status()
+        return response.json()
+    breaker = BREAKERS[upstream]
+    try:
+        return breaker.call(get)
+    except UpstreamError:
+        raise
+    except Exception as e:
+        raise UpstreamError(breaker.name) from e
+
+# --------------------------
+# Last Known Good Data
+# --------------------------
+_stale_cache = OrderedDict()
+_stale_lock = threading.Lock()
+
+
+def remember(key, data):
+    """Store a successful response along with when it was fetched"""
+    with _stale_lock:
+        _stale_cache[key] = (copy.deepcopy(data), datetime.now().strftime("%Y-%m-%d %H:%M"))
+        _stale_cache.move_to_end(key)
+        while len(_stale_cache) > STALE_CACHE_SIZE:
+            _stale_cache.popitem(last=False)
+
+
+def recall(key):
+    """Return (data, as_of) for the last good response, or (None, None)"""
+    with _stale_lock:
+        return _stale_cache.get(key, (None, None))
+
+
+def unavailable_message(error):
+    """User-facing text for a failed upstream call; never includes the raw error"""
+    name = error.name if isinstance(error, UpstreamError) else "Live data"
+    return f"{name} is temporarily unavailable. Please try again shortly."
+
+
+def fallback(key, error):
+    """Serve a copy of the last known good data marked with stale_as_of, or an error dict.
+
+    The underlying error is logged rather than shown to the user.
+    """
+    cause = error.__cause__ if isinstance(error, UpstreamError) and error.__cause__ else error
+    logger.warning("Upstream call for %s failed: %s", key, cause)
+    data, as_of = recall(key)
+    if data is not None:
+        return dict(copy.deepcopy(data), stale_as_of=as_of)
+    return {"error": unavailable_message(error)}
@@ -0,0 +1,520 @@
+import argparse
+import asyncio
+import atexit
+import datetime
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib.metadata import PackageNotFoundError, version as package_version
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+# The harness speaks Streamlit's internal wire format: radio/selectbox send the chosen
+# label as string_value from 1.54, and websockets.asyncio.client arrived in websockets 13
+MIN_VERSIONS = {"streamlit": (1, 54), "websockets": (13, 0)}
+
+
+def check_versions():
+    """Exit with a clear message if installed packages are too old for the harness"""
+    problems = []
+    for package, minimum in MIN_VERSIONS.items():
+        wanted = ".".join(map(str, minimum))
+        try:
+            installed = package_version(package)
+        except PackageNotFoundError:
+            problems.append(f"{package}>={wanted} is required but not installed")
+            continue
+        parts = tuple(int(p) for p in installed.split(".")[:2] if p.isdigit())
+        if parts < minimum:
+            problems.append(f"{package}>={wanted} is required, found {installed}")
+    if problems:
+        sys.exit("load_test.py: " + "; ".join(problems))
+
+
+check_versions()
+
+import requests
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed, WebSocketException
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+INITIAL_LOAD = "Initial load"
+PAGES = ["🌤️ Weather", "🧺 Picnic Planner", "🧠 Daily Quiz"]
+CITIES = ["Kochi", "London", "Paris", "Tokyo", "Nairobi", "Lima"]
+UPSTREAM_CALLS_FILE = "upstream_calls.txt"
+
+# --------------------------
+# Stubbed Upstream
+# --------------------------
+class StubUpstream:
+    """Canned Nominatim, Open-Meteo and OpenTDB responses with configurable latency and failures"""
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def respond(self, host, path, params):
+        """Return (status, payload) for a request to host + path"""
+        with self.lock:
+            self.calls += 1
+            failed = self.random.random() < self.failure_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            return 503, {}
+
+        if "nominatim" in host:
+            return 200, [{"lat": "9.93", "lon": "76.26"}]
+        if "open-meteo" in host:
+            return 200, self.forecast(params)
+        if "opentdb" in host and path == "/api_category.php":
+            return 200, {"trivia_categories": [
+                {"id": 9, "name": "General Knowledge"},
+                {"id": 17, "name": "Science & Nature"},
+                {"id": 22, "name": "Geography"}
+            ]}
+        if "opentdb" in host:
+            return 200, {"response_code": 0, "results": [{
+                "question": "Which gas do plants absorb from the atmosphere?",
+                "correct_answer": "Carbon dioxide",
+                "incorrect_answers": ["Oxygen", "Nitrogen", "Helium"]
+            }]}
+        return 404, {}
+
+    def forecast(self, params):
+        days = int(params.get("forecast_days", ["7"])[0])
+        today = datetime.date.today()
+        daily = {
+            "time": [(today + datetime.timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)],
+            "weathercode": [[0, 1, 2, 3, 61][i % 5] for i in range(days)],
+            "temperature_2m_max": [18 + (i % 10) for i in range(days)],
+            "temperature_2m_min": [10 + (i % 5) for i in range(days)],
+            "precipitation_probability_max": [(i * 15) % 90 for i in range(days)],
+            "sunrise": [f"{d}T06:00" for d in range(days)],
+            "sunset": [f"{d}T18:30" for d in range(days)],
+            "uv_index_max": [5.0] * days
+        }
+        return {
+            "current_weather": {"temperature": 24.5, "windspeed": 11.2, "weathercode": 1},
+            "hourly": {
+                "temperature_2m": [22.0] * 24,
+                "relative_humidity_2m": [65] * 24,
+                "wind_speed_10m": [10.0] * 24
+            },
+            "daily": daily
+        }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves /<upstream host>/<path> from the StubUpstream attached to the server"""
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip("/").partition("/")
+        status, payload = self.server.upstream.respond(host, "/" + path, parse_qs(parts.query))
+        body = json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client hit its read timeout and hung up
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_upstream(upstream):
+    """Serve the stub on a free local port in a background thread and return its base URL"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.upstream = upstream
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+# --------------------------
+# Metrics
+# --------------------------
+class Metrics:
+    """Collector of rerun latencies and errors per page.
+
+    Latencies only cover reruns that finished. Reruns that timed out or lost
+    their connection are counted as failed and kept out of the percentiles.
+    """
+    def __init__(self):
+        self.latencies = {bucket: [] for bucket in [INITIAL_LOAD] + PAGES}
+        self.errors = {bucket: 0 for bucket in [INITIAL_LOAD] + PAGES}
+        self.failed = {bucket: 0 for bucket in [INITIAL_LOAD] + PAGES}
+
+    def record(self, bucket, seconds, error):
+        """Record a finished rerun; error means the page rendered an exception or st.error"""
+        self.latencies[bucket].append(seconds)
+        if error:
+            self.errors[bucket] += 1
+
+    def record_failure(self, bucket):
+        self.failed[bucket] += 1
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+# --------------------------
+# Headless Websocket Session
+# --------------------------
+class SessionAborted(Exception):
+    """Raised when a session can no longer trust its connection and must stop"""
+
+
+class Session:
+    """One simulated browser tab talking to the server over its websocket"""
+    def __init__(self, metrics, url, timeout):
+        self.metrics = metrics
+        self.url = url
+        self.timeout = timeout
+        self.ws = None
+        self.bucket = INITIAL_LOAD   # Page whose flow is currently running
+        self.elements = []   # Elements rendered by the last completed run
+        self.states = {}     # Widget id -> WidgetState, resent on every rerun like the browser does
+
+    async def connect(self):
+        self.ws = await connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self.ws:
+            await self.ws.close()
+
+    async def rerun(self, bucket, triggers=()):
+        """Send a rerun with the current widget states, wait for the script to finish and record it.
+
+        ConnectionClosed propagates so the caller can abort the session.
+        """
+        self.bucket = bucket
+        msg = BackMsg()
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        for widget_id in triggers:
+            msg.rerun_script.widget_states.widgets.add(id=widget_id, trigger_value=True)
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        try:
+            error = await asyncio.wait_for(self.read_until_finished(), self.timeout)
+        except asyncio.TimeoutError:
+            self.metrics.record_failure(bucket)
+            await self.drain()
+            return
+        self.metrics.record(bucket, time.perf_counter() - start, error)
+
+    async def drain(self):
+        """Wait out a timed-out run so its late script_finished isn't taken for the next one"""
+        try:
+            await asyncio.wait_for(self.read_until_finished(), self.timeout)
+        except asyncio.TimeoutError:
+            raise SessionAborted from None
+
+    async def read_until_finished(self):
+        """Collect elements until the final script_finished, following st.rerun() restarts"""
+        elements = []
+        error = False
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self.ws.recv())
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                elements = []
+                error = False
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                elements.append(element)
+                element_type = element.WhichOneof("type")
+                if element_type == "exception" or (
+                        element_type == "alert" and element.alert.format == Alert.ERROR):
+                    error = True
+            elif kind == "script_finished" and msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                self.elements = elements
+                return error
+
+    def widgets(self, element_type, label=None, key=None):
+        """Widgets of one type from the last run, optionally filtered by label or key prefix"""
+        found = []
+        for element in self.elements:
+            if element.WhichOneof("type") != element_type:
+                continue
+            widget = getattr(element, element_type)
+            if label is not None and widget.label != label:
+                continue
+            if key is not None and not widget.id.rsplit("-", 1)[-1].startswith(key):
+                continue
+            found.append(widget)
+        return found
+
+    def set_state(self, widget, **value):
+        self.states[widget.id] = WidgetState(id=widget.id, **value)
+
+    async def go_to(self, page):
+        radio = self.widgets("radio", label="Go to")
+        if radio:
+            self.set_state(radio[0], string_value=page)
+        await self.rerun(page)
+
+    async def weather_flow(self, rng):
+        page = PAGES[0]
+        await self.go_to(page)
+        city_inputs = self.widgets("text_input", label="Enter City")
+        if city_inputs:
+            self.set_state(city_inputs[0], string_value=rng.choice(CITIES))
+            await self.rerun(page)
+
+    async def picnic_flow(self, rng):
+        page = PAGES[1]
+        await self.go_to(page)
+        city_inputs = self.widgets("text_input", label="Enter a city to get picnic plan")
+        if city_inputs:
+            self.set_state(city_inputs[0], string_value=rng.choice(CITIES))
+            await self.rerun(page)
+
+        # Alternate between a recommended date and a specific date so both paths are measured
+        select_buttons = self.widgets("button", key="btn_")
+        date_inputs = self.widgets("date_input")
+        if select_buttons and (not date_inputs or rng.random() < 0.5):
+            await self.rerun(page, [rng.choice(select_buttons).id])
+        elif date_inputs:
+            day = datetime.date.today() + datetime.timedelta(days=rng.randint(0, 13))
+            self.set_state(date_inputs[0], string_array_value={"data": [day.isoformat()]})
+            await self.rerun(page)
+
+        items = self.widgets("checkbox", key="item_")
+        for item in rng.sample(items, min(2, len(items))):
+            self.set_state(item, bool_value=False)
+            await self.rerun(page)
+
+        save_buttons = self.widgets("button", label="Save Plan")
+        if save_buttons:
+            await self.rerun(page, [save_buttons[0].id])
+
+    async def quiz_flow(self, rng):
+        page = PAGES[2]
+        await self.go_to(page)
+        practice_buttons = self.widgets("button", label="🌱 Enter Practice Mode")
+        if practice_buttons:
+            await self.rerun(page, [practice_buttons[0].id])
+
+        categories = self.widgets("selectbox", label="Select Quiz Category:")
+        if categories:
+            self.set_state(categories[0], string_value=rng.choice(list(categories[0].options)))
+            await self.rerun(page)
+            start_buttons = self.widgets("button", label="Start Quiz")
+            if start_buttons:
+                await self.rerun(page, [start_buttons[0].id])
+
+        options = self.widgets("button", key="opt")
+        if options:
+            await self.rerun(page, [rng.choice(options).id])
+
+        next_buttons = self.widgets("button", label=" Next  Challenge")
+        if next_buttons:
+            await self.rerun(page, [next_buttons[0].id])
+
+
+async def run_session(metrics, url, iterations, pages, timeout, seed):
+    """Drive one session through the selected page flows"""
+    rng = random.Random(seed)
+    session = Session(metrics, url, timeout)
+    flows = {
+        PAGES[0]: session.weather_flow,
+        PAGES[1]: session.picnic_flow,
+        PAGES[2]: session.quiz_flow
+    }
+    try:
+        await session.connect()
+        await session.rerun(INITIAL_LOAD)
+        for _ in range(iterations):
+            for page in pages:
+                await flows[page](rng)
+    except SessionAborted:
+        pass
+    except (OSError, WebSocketException):
+        # Covers refused connections, rejected handshakes and dropped sockets
+        metrics.record_failure(session.bucket)
+    finally:
+        await session.close()
+
+
+async def run_sessions(metrics, url, args, pages, base_seed):
+    await asyncio.gather(*(
+        run_session(metrics, url, args.iterations, pages, args.timeout, base_seed + i)
+        for i in range(args.sessions)
+    ))
+
+# --------------------------
+# Server Under Test
+# --------------------------
+def serve(args):
+    """Run `streamlit run app.py` in this process with upstream hosts routed to a local HTTP stub.
+
+    Only the host is rewritten, so the app's real requests/urllib3 path and its
+    timeouts still apply to the slow or failing stub.
+    """
+    upstream = StubUpstream(args.upstream_latency / 1000, args.failure_rate, args.seed)
+    stub_url = start_stub_upstream(upstream)
+    real_get = requests.get
+
+    def routed_get(url, **kwargs):
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return real_get(f"{stub_url}/{parts.netloc}{parts.path}{query}", **kwargs)
+    mock.patch("requests.get", side_effect=routed_get).start()
+
+    def write_upstream_calls():
+        with open(UPSTREAM_CALLS_FILE, "w") as f:
+            f.write(str(upstream.calls))
+    atexit.register(write_upstream_calls)
+
+    from streamlit.web import cli as stcli
+    sys.argv = [
+        "streamlit", "run", APP_FILE,
+        "--server.port", str(args.port),
+        "--server.headless", "true",
+        "--server.fileWatcherType", "none",
+        "--browser.gatherUsageStats", "false"
+    ]
+    stcli.main()
+
+
+def start_server(args, workdir):
+    """Launch the server in a scratch directory so saved plans and streaks don't touch real data"""
+    command = [
+        sys.executable, os.path.abspath(__file__), "--serve",
+        "--port", str(args.port),
+        "--upstream-latency", str(args.upstream_latency),
+        "--failure-rate", str(args.failure_rate)
+    ]
+    if args.seed is not None:
+        command += ["--seed", str(args.seed)]
+    server = subprocess.Popen(command, cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    health_url = f"http://localhost:{args.port}/_stcore/health"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("Streamlit server exited during startup")
+        try:
+            if requests.get(health_url, timeout=1).ok:
+                return server
+        except requests.RequestException:
+            pass  # Still starting up
+        time.sleep(0.2)
+    server.terminate()
+    server.wait()
+    raise RuntimeError("Streamlit server did not become healthy within 60s")
+
+
+def stop_server(server, workdir):
+    """Stop the server and return how many upstream calls it made"""
+    server.terminate()
+    try:
+        server.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+    try:
+        with open(os.path.join(workdir, UPSTREAM_CALLS_FILE)) as f:
+            return int(f.read())
+    except (FileNotFoundError, ValueError):
+        return None
+
+# --------------------------
+# Reporting
+# --------------------------
+def print_report(metrics, elapsed, sessions, upstream_calls):
+    """Print throughput and per-page latency; percentiles cover finished reruns only"""
+    finished = sum(len(v) for v in metrics.latencies.values())
+    errors = sum(metrics.errors.values())
+    failed = sum(metrics.failed.values())
+    attempted = finished + failed
+    print(f"\nOne Streamlit server, {sessions} concurrent websocket sessions")
+    print(f"Wall time: {elapsed:.2f}s | Finished reruns: {finished} | Failed reruns: {failed} | "
+          f"Throughput: {finished / elapsed if elapsed else 0:.1f} reruns/s | "
+          f"Upstream calls: {upstream_calls if upstream_calls is not None else 'unknown'}")
+    print(f"{'Page':<18}{'Reruns':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'App err':>9}{'Failed':>8}{'Err %':>8}")
+    for bucket in [INITIAL_LOAD] + PAGES:
+        latencies = metrics.latencies[bucket]
+        page_failed = metrics.failed[bucket]
+        if not latencies and not page_failed:
+            continue
+        page_errors = metrics.errors[bucket]
+        print(f"{bucket:<18}{len(latencies):>8}"
+              f"{percentile(latencies, 50) * 1000:>10.1f}"
+              f"{percentile(latencies, 95) * 1000:>10.1f}"
+              f"{percentile(latencies, 99) * 1000:>10.1f}"
+              f"{page_errors:>9}{page_failed:>8}"
+              f"{(page_errors + page_failed) / (len(latencies) + page_failed) * 100:>7.1f}%")
+    print(f"App err: page rendered an exception or st.error. "
+          f"Failed: rerun timed out or lost its connection (excluded from percentiles).")
+    print(f"Overall error rate: {(errors + failed) / attempted * 100 if attempted else 0:.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test one CLIMATASK server against a stubbed upstream")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent websocket sessions")
+    parser.add_argument("--iterations", type=int, default=3, help="Flow repetitions per session")
+    parser.add_argument("--pages", nargs="+", choices=["weather", "picnic", "quiz"],
+                        default=["weather", "picnic", "quiz"], help="Page flows to exercise")
+    parser.add_argument("--upstream-latency", type=float, default=50, help="Stub upstream delay in ms")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of upstream calls that fail")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-rerun timeout in seconds")
+    parser.add_argument("--port", type=int, default=8599, help="Port for the server under test")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    page_names = {"weather": PAGES[0], "picnic": PAGES[1], "quiz": PAGES[2]}
+    pages = [page_names[p] for p in args.pages]
+    metrics = Metrics()
+    base_seed = args.seed if args.seed is not None else random.randrange(1 << 30)
+
+    workdir = tempfile.mkdtemp(prefix="climatask-load-")
+    upstream_calls = None
+    try:
+        server = start_server(args, workdir)
+        try:
+            # Timed from a warm, healthy server so startup and imports aren't counted
+            start = time.perf_counter()
+            asyncio.run(run_sessions(metrics, f"ws://localhost:{args.port}/_stcore/stream",
+                                     args, pages, base_seed))
+            elapsed = time.perf_counter() - start
+        finally:
+            upstream_calls = stop_server(server, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(metrics, elapsed, args.sessions, upstream_calls)
+
+
+if __name__ == "__main__":
+    main()
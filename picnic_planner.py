@@ -1,15 +1,15 @@
 import streamlit as st
 import datetime
 import json
-import requests
+from circuit_breaker import guarded_get_json, remember, fallback
 
 def fetch_weather_forecast(city):
     """Fetch weather forecast data"""
+    cache_key = ("forecast", city.strip().lower())
     try:
         geocode_url = f"https://nominatim.openstreetmap.org/search?q={city}&format=json&limit=1"
         headers = {'User-Agent': 'CLIMATASK Weather App'}
-        response = requests.get(geocode_url, headers=headers)
-        data = response.json()
+        data = guarded_get_json("nominatim", geocode_url, headers=headers)
         
         if not data:
             return {"error": "City not found."}
@@ -26,11 +26,11 @@ def fetch_weather_forecast(city):
             "forecast_days": 14
         }
         
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        return response.json()
+        forecast = guarded_get_json("open-meteo", base_url, params=params)
+        remember(cache_key, forecast)
+        return forecast
     except Exception as e:
-        return {"error": str(e)}
+        return fallback(cache_key, e)
 
 def get_weather_description(code):
     descriptions = {
@@ -149,6 +149,8 @@ def display_picnic_planner_page():
         if "error" in forecast:
             st.error(forecast["error"])
             return
+        if "stale_as_of" in forecast:
+            st.warning(f"Live data unavailable. Showing last known forecast as of {forecast['stale_as_of']}.")
 
     best_dates = find_best_picnic_dates(forecast)
     
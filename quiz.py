@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+from circuit_breaker import guarded_get_json, remember, fallback, unavailable_message
 import html
 import random
 import json
@@ -45,28 +45,41 @@ def calculate_streak(current_streak, last_play_date):
 # Quiz Core Functions
 # --------------------------
 def get_categories():
-    """Fetch available quiz categories"""
-    response = requests.get(CATEGORIES_URL)
-    return response.json()["trivia_categories"]
+    """Fetch available quiz categories as {"categories": [...]} or {"error": message}"""
+    cache_key = ("categories",)
+    try:
+        data = {"categories": guarded_get_json("opentdb", CATEGORIES_URL)["trivia_categories"]}
+        remember(cache_key, data)
+        return data
+    except Exception as e:
+        return fallback(cache_key, e)
 
-def fetch_question(category_id):
-    """Fetch a new question from API"""
+def fetch_question(category_id, exclude=None):
+    """Fetch a new question from API; a cached copy of the question text in exclude is never served"""
+    cache_key = ("question", category_id)
     try:
         params = {"amount": 1, "category": category_id, "type": "multiple"}
-        response = requests.get(TRIVIA_API_URL, params=params, timeout=10)
-        data = response.json()
+        data = guarded_get_json("opentdb", TRIVIA_API_URL, params=params)
         if data["response_code"] != 0 or not data["results"]:
             return None
         
         question_data = data["results"][0]
-        return {
+        question = {
             "question": html.unescape(question_data["question"]),
             "correct": html.unescape(question_data["correct_answer"]),
             "options": [html.unescape(ans) for ans in question_data["incorrect_answers"]] + [html.unescape(question_data["correct_answer"])]
         }
+        remember(cache_key, question)
+        return question
     except Exception as e:
-        st.error(f"API Error: {str(e)}")
-        return None
+        stale = fallback(cache_key, e)
+        if exclude is not None and stale.get("question") == exclude:
+            # Serving the question just answered would loop practice mode forever
+            stale = {"error": unavailable_message(e)}
+        if "error" in stale:
+            st.error(stale["error"])
+            return None
+        return stale
 
 # --------------------------
 # Quiz Display Functions
@@ -86,13 +99,14 @@ def display_quiz_page():
             'current_question': None,
             'selected_answer': None,
             'daily_attempt_used': last_play_date == today_str,
-            'categories': get_categories(),
+            'categories': [],
             'selected_category': None,
             'result_data': None,
             'practice_mode': False,
             'show_practice_button': False,
             'force_refresh': False,
-            'retry_count': 0
+            'retry_count': 0,
+            'last_question': None
         }
 
     # Custom styling
@@ -177,6 +191,14 @@ def display_quiz_page():
         return
 
     # Category selection
+    if not st.session_state.quiz['categories']:
+        categories = get_categories()
+        if "error" not in categories:
+            st.session_state.quiz['categories'] = categories["categories"]
+        elif not st.session_state.quiz['selected_category']:
+            st.error(categories["error"])
+            return
+
     if not st.session_state.quiz['selected_category']:
         category_names = [cat['name'] for cat in st.session_state.quiz['categories']]
         selected = st.selectbox("Select Quiz Category:", category_names)
@@ -185,7 +207,8 @@ def display_quiz_page():
             selected_category = next(cat for cat in st.session_state.quiz['categories'] if cat['name'] == selected)
             st.session_state.quiz['selected_category'] = selected_category['id']
             with st.spinner("🌍 Loading  question..."):
-                question_data = fetch_question(st.session_state.quiz['selected_category'])
+                question_data = fetch_question(st.session_state.quiz['selected_category'],
+                                               exclude=st.session_state.quiz.get('last_question'))
             if question_data:
                 random.shuffle(question_data['options'])
                 st.session_state.quiz['current_question'] = question_data
@@ -196,6 +219,8 @@ def display_quiz_page():
     # Question handling
     if st.session_state.quiz['current_question']:
         q = st.session_state.quiz['current_question']
+        if "stale_as_of" in q:
+            st.info(f"Live data unavailable. Showing a saved question from {q['stale_as_of']}.")
         
         with st.container():
             st.markdown(f"""
@@ -223,7 +248,8 @@ def display_quiz_page():
         if st.session_state.quiz['practice_mode'] and st.session_state.quiz['selected_category']:
             try:
                 with st.spinner("🌱 Growing your next question..."):
-                    question_data = fetch_question(st.session_state.quiz['selected_category'])
+                    question_data = fetch_question(st.session_state.quiz['selected_category'],
+                                                   exclude=st.session_state.quiz.get('last_question'))
                 
                 if question_data:
                     random.shuffle(question_data['options'])
@@ -252,5 +278,6 @@ def display_quiz_page():
         
         # Store result and update UI
         st.session_state.quiz['result_data'] = (is_correct, correct_answer)
+        st.session_state.quiz['last_question'] = st.session_state.quiz['current_question']['question']
         st.balloons()
         st.rerun()
\ No newline at end of file
@@ -0,0 +1,133 @@
+import time
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, UpstreamError,
+    fallback, remember
+)
+
+
+def fail():
+    raise ValueError("upstream down")
+
+
+def make_breaker():
+    return CircuitBreaker("Test service", failure_threshold=2, latency_threshold=0.05, reset_timeout=0.1)
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(ValueError):
+            breaker.call(fail)
+
+
+def test_opens_after_consecutive_errors():
+    breaker = make_breaker()
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    assert breaker.state == CLOSED
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+
+
+def test_success_resets_failure_count():
+    breaker = make_breaker()
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    assert breaker.call(lambda: "ok") == "ok"
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    assert breaker.state == CLOSED
+
+
+def test_slow_calls_count_as_failures():
+    breaker = make_breaker()
+    for _ in range(2):
+        assert breaker.call(lambda: time.sleep(0.06) or "late") == "late"
+    assert breaker.state == OPEN
+
+
+def test_fails_fast_while_open():
+    breaker = make_breaker()
+    trip(breaker)
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(calls.append, 1)
+    assert calls == []
+
+
+def test_single_half_open_probe():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.11)
+
+    def probe():
+        assert breaker.state == HALF_OPEN
+        # A concurrent caller is turned away while the probe is in flight
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: "second")
+        return "probe"
+
+    assert breaker.call(probe) == "probe"
+    assert breaker.state == CLOSED
+
+
+def test_failed_probe_reopens():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.11)
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+
+
+def test_interrupted_probe_releases_breaker():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.11)
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        breaker.call(interrupted)
+    assert breaker.state == OPEN
+    assert not breaker.probing
+    time.sleep(0.11)
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_fallback_serves_copy_of_stale_data():
+    key = ("test", "stale")
+    remember(key, {"options": ["a", "b"]})
+    stale = fallback(key, UpstreamError("Test service"))
+    assert stale["options"] == ["a", "b"]
+    assert "stale_as_of" in stale
+
+    stale["options"].append("c")
+    assert fallback(key, UpstreamError("Test service"))["options"] == ["a", "b"]
+
+
+def test_fallback_hides_raw_error_without_stale_data():
+    error = UpstreamError("Test service")
+    error.__cause__ = ConnectionError("HTTPSConnectionPool(host='api.open-meteo.com') Max retries exceeded")
+    result = fallback(("test", "missing"), error)
+    assert result == {"error": "Test service is temporarily unavailable. Please try again shortly."}
+
+
+def test_guarded_get_json_wraps_upstream_errors(monkeypatch):
+    def broken_get(url, **kwargs):
+        raise ConnectionError("connection refused")
+
+    monkeypatch.setattr(circuit_breaker.requests, "get", broken_get)
+    monkeypatch.setitem(circuit_breaker.BREAKERS, "test", make_breaker())
+    with pytest.raises(UpstreamError) as excinfo:
+        circuit_breaker.guarded_get_json("test", "https://example.invalid")
+    assert excinfo.value.name == "Test service"
+    assert isinstance(excinfo.value.__cause__, ConnectionError)
@@ -0,0 +1,175 @@
+import os
+from collections import OrderedDict
+
+import pytest
+import requests
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+import circuit_breaker
+from circuit_breaker import CircuitBreaker, remember
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+FORECAST = {
+    "current_weather": {"temperature": 24.5, "windspeed": 11.2, "weathercode": 1},
+    "hourly": {"relative_humidity_2m": [65]},
+    "daily": {
+        "time": ["2026-01-01", "2026-01-02"],
+        "weathercode": [0, 1],
+        "temperature_2m_max": [24, 25],
+        "temperature_2m_min": [14, 15],
+        "precipitation_probability_max": [10, 20]
+    }
+}
+QUESTION = {"question": "Which gas do plants absorb?", "correct": "Carbon dioxide",
+            "options": ["Oxygen", "Nitrogen", "Helium", "Carbon dioxide"]}
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeUpstream:
+    """Answers like Nominatim, Open-Meteo and OpenTDB until it is taken down"""
+    def __init__(self):
+        self.down = False
+
+    def get(self, url, params=None, **kwargs):
+        if self.down:
+            raise requests.ConnectionError("HTTPSConnectionPool(host='upstream') Max retries exceeded")
+        if "nominatim" in url:
+            return FakeResponse([{"lat": "9.93", "lon": "76.26"}])
+        if "open-meteo" in url:
+            return FakeResponse(FORECAST)
+        if "api_category" in url:
+            return FakeResponse({"trivia_categories": [{"id": 9, "name": "General Knowledge"}]})
+        return FakeResponse({"response_code": 0, "results": [{
+            "question": QUESTION["question"],
+            "correct_answer": QUESTION["correct"],
+            "incorrect_answers": QUESTION["options"][:3]
+        }]})
+
+
+@pytest.fixture
+def upstream(monkeypatch, tmp_path):
+    """Fresh breakers and stale cache, requests.get routed to a FakeUpstream, cwd in tmp_path"""
+    for name, breaker in list(circuit_breaker.BREAKERS.items()):
+        monkeypatch.setitem(circuit_breaker.BREAKERS, name, CircuitBreaker(breaker.name))
+    monkeypatch.setattr(circuit_breaker, "_stale_cache", OrderedDict())
+    fake = FakeUpstream()
+    monkeypatch.setattr(circuit_breaker.requests, "get", fake.get)
+    monkeypatch.chdir(tmp_path)
+    return fake
+
+
+def test_fetch_weather_data_serves_stale_data(upstream):
+    from app import fetch_weather_data
+    fresh = fetch_weather_data(city="Kochi")
+    upstream.down = True
+    stale = fetch_weather_data(city="Kochi")
+    assert stale["current_weather"] == fresh["current_weather"]
+    assert "stale_as_of" in stale
+
+
+def test_fetch_weather_data_error_without_cache(upstream):
+    from app import fetch_weather_data
+    upstream.down = True
+    assert fetch_weather_data(city="Kochi") == {
+        "error": "Location service is temporarily unavailable. Please try again shortly."
+    }
+
+
+def test_fetch_weather_forecast_serves_stale_data(upstream):
+    from picnic_planner import fetch_weather_forecast
+    fresh = fetch_weather_forecast("Kochi")
+    upstream.down = True
+    stale = fetch_weather_forecast("Kochi")
+    assert stale["daily"] == fresh["daily"]
+    assert "stale_as_of" in stale
+
+
+def test_fetch_weather_forecast_error_without_cache(upstream):
+    from picnic_planner import fetch_weather_forecast
+    upstream.down = True
+    assert fetch_weather_forecast("Kochi") == {
+        "error": "Location service is temporarily unavailable. Please try again shortly."
+    }
+
+
+def test_get_categories_serves_stale_data_or_error(upstream):
+    from quiz import get_categories
+    upstream.down = True
+    assert get_categories() == {"error": "Quiz service is temporarily unavailable. Please try again shortly."}
+    upstream.down = False
+    fresh = get_categories()
+    upstream.down = True
+    stale = get_categories()
+    assert stale["categories"] == fresh["categories"]
+    assert "stale_as_of" in stale
+
+
+def test_fetch_question_serves_stale_question(upstream):
+    from quiz import fetch_question
+    fresh = fetch_question(9)
+    upstream.down = True
+    stale = fetch_question(9)
+    assert stale["question"] == fresh["question"]
+    assert "stale_as_of" in stale
+
+
+def test_fetch_question_skips_question_just_answered(upstream):
+    from quiz import fetch_question
+    fetch_question(9)
+    upstream.down = True
+    assert fetch_question(9, exclude=QUESTION["question"]) is None
+
+
+def test_weather_page_shows_as_of_notice(upstream):
+    at = AppTest.from_file(APP_FILE).run()
+    at.text_input[0].input("Kochi").run()
+    assert not at.warning
+    upstream.down = True
+    at.run()
+    assert "as of" in at.warning[0].value
+    assert not at.error
+
+
+def test_weather_page_shows_readable_error_without_cache(upstream):
+    upstream.down = True
+    at = AppTest.from_file(APP_FILE).run()
+    at.text_input[0].input("Kochi").run()
+    assert at.error[0].value == "Location service is temporarily unavailable. Please try again shortly."
+
+
+def test_picnic_page_shows_as_of_notice(upstream):
+    at = AppTest.from_file(APP_FILE).run()
+    at.sidebar.radio[0].set_value("🧺 Picnic Planner").run()
+    at.text_input[0].input("Kochi").run()
+    upstream.down = True
+    at.run()
+    assert any("as of" in warning.value for warning in at.warning)
+
+
+def test_quiz_page_shows_saved_question_notice(upstream):
+    remember(("categories",), {"categories": [{"id": 9, "name": "General Knowledge"}]})
+    remember(("question", 9), QUESTION)
+    upstream.down = True
+    at = AppTest.from_file(APP_FILE).run()
+    at.sidebar.radio[0].set_value("🧠 Daily Quiz").run()
+    next(b for b in at.button if b.label == "Start Quiz").click().run()
+    assert "Showing a saved question" in at.info[0].value
+
+
+def test_quiz_page_shows_error_without_categories(upstream):
+    upstream.down = True
+    at = AppTest.from_file(APP_FILE).run()
+    at.sidebar.radio[0].set_value("🧠 Daily Quiz").run()
+    assert at.error[0].value == "Quiz service is temporarily unavailable. Please try again shortly."